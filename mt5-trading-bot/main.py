@@ -2,12 +2,18 @@
 """Main entry point for MT5 Trading Bot."""
 import os
 import sys
-import io
 import time
+import asyncio
+import functools
+import math
+import logging
+import logging.handlers
+import queue
 
-# Fix Windows console encoding
+# Fix Windows console encoding in place (no extra wrapper); keep line buffering so
+# startup and connect() messages show up immediately
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace', line_buffering=True)
 
 from dotenv import load_dotenv
 
@@ -22,13 +28,56 @@ from src.risk.state import AccountState
 from src.signals.generators import TrendFollowingGenerator, MeanReversionGenerator, BreakoutGenerator
 from src.core.types import StrategyConfig
 from mt5.connection import MT5Connection
+from mt5.rates_buffer import RatesBuffer
 
 # MT5 Connection Details
 MT5_SERVER = "FBS-Demo"
 MT5_LOGIN = 105261321
 MT5_PASSWORD = "1LlT+/;$"
 
-def main():
+LOG_FILE = os.path.join("logs", "trading_bot.log")
+
+BAR_SECONDS = 900  # M15, the primary strategy timeframe
+BAR_CLOSE_DELAY = 2.0  # Seconds to wait after a bar closes so MT5 has published it
+POSITION_MONITOR_INTERVAL = 5  # Seconds between open-position reports
+
+logger = logging.getLogger(__name__)
+
+def seconds_until_next_bar(now: float) -> float:
+    """Seconds to sleep until just after the next M15 bar closes."""
+    next_bar_time = (math.floor(now / BAR_SECONDS) + 1) * BAR_SECONDS
+    return max(1.0, next_bar_time - now + BAR_CLOSE_DELAY)
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue so formatting and I/O run on a background thread."""
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=5, encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+    
+    # Attach to the root logger so module loggers (risk, engine, connection) share the queue
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    return listener
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Detach the queue from the root logger, then write out what is left in it."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    listener.stop()
+
+async def main():
     """Main trading bot loop."""
     print("Starting MT5 Trading Bot...")
     print("=" * 60)
@@ -85,8 +134,8 @@ def main():
         trend_strategy,
         StrategyConfig(
             name="Trend Following",
-            symbols=["EURUSD", "GBPUSD"],
-            timeframes=["M15", "H1"],
+            symbols=("EURUSD", "GBPUSD"),
+            timeframes=("M15", "H1"),
             enabled=True
         )
     )
@@ -96,8 +145,8 @@ def main():
         mean_rev_strategy,
         StrategyConfig(
             name="Mean Reversion",
-            symbols=["EURUSD", "GBPUSD"],
-            timeframes=["M15"],
+            symbols=("EURUSD", "GBPUSD"),
+            timeframes=("M15",),
             enabled=True
         )
     )
@@ -107,8 +156,8 @@ def main():
         breakout_strategy,
         StrategyConfig(
             name="Breakout",
-            symbols=["EURUSD", "GBPUSD"],
-            timeframes=["H1"],
+            symbols=("EURUSD", "GBPUSD"),
+            timeframes=("H1",),
             enabled=True
         )
     )
@@ -116,6 +165,9 @@ def main():
     # Initialize orchestrator
     orchestrator = TradingOrchestrator(strategy_engine, risk_engine)
     
+    # Select every monitored symbol in MarketWatch once up front; skip the ones that fail
+    unavailable_symbols = frozenset(mt5_conn.select_symbols(orchestrator.monitored_symbols))
+    
     print("\n" + "=" * 60)
     print("Trading bot initialized successfully!")
     print("Strategies registered:")
@@ -144,125 +196,153 @@ def main():
     print("Monitoring symbols: EURUSD, GBPUSD")
     print("Press Ctrl+C to stop the bot...\n")
     
-    last_check_time = {}
-    check_interval = 60  # Check every 60 seconds
+    log_listener = setup_logging()
+    rates_buffer = RatesBuffer(mt5_conn, 'M15', capacity=128)
+    loop = asyncio.get_running_loop()
     
-    try:
+    async def signal_loop():
+        """Evaluate strategies once per closed M15 bar."""
         while True:
-            current_time = time.time()
+            # Get all symbols we're monitoring that MT5 could select
+            all_symbols = orchestrator.monitored_symbols - unavailable_symbols
+            
+            # Refresh buffered market data; only bars since the last pass are fetched (M15 timeframe is primary)
+            market_data = await loop.run_in_executor(None, rates_buffer.refresh, all_symbols)
+            
+            # Every symbol with data is processed once per bar
+            due_symbols = list(market_data)
+            
+            # Snapshot ticks, open positions and account info in one concurrent round-trip
+            snapshot = await loop.run_in_executor(None, mt5_conn.get_snapshot, due_symbols)
+            open_symbols = {pos['symbol'] for pos in snapshot['positions']}
+            
+            account_info = snapshot['account']
+            if account_info:
+                risk_engine.update_account_state(AccountState(
+                    balance=account_info['balance'],
+                    equity=account_info['equity'],
+                    margin=account_info['margin'],
+                    free_margin=account_info['free_margin'],
+                    margin_level=account_info['margin_level']
+                ))
             
-            # Get all symbols we're monitoring
-            all_symbols = set()
-            for config in strategy_engine.configs.values():
-                all_symbols.update(config.symbols)
+            # Process through orchestrator once for all symbols
+            recommendations = orchestrator.process_tick(market_data)
             
-            # Fetch market data for each symbol
-            market_data = {}
-            for symbol in all_symbols:
-                # Get rates for M15 timeframe (primary)
-                rates = mt5_conn.get_rates(symbol, 'M15', 100)
-                if rates:
-                    market_data[symbol] = rates
-                    
-                    # Check if we should process this symbol (every check_interval seconds)
-                    if symbol not in last_check_time or (current_time - last_check_time[symbol]) >= check_interval:
-                        print(f"\n[{time.strftime('%H:%M:%S')}] Processing {symbol}...")
+            for symbol in due_symbols:
+                logger.info("Processing %s...", symbol)
+                
+                tick = snapshot['ticks'][symbol]
+                has_position = symbol in open_symbols
+                
+                # Execute trades for valid recommendations
+                for rec in recommendations:
+                    if rec.symbol == symbol:
+                        # Don't open new position if we already have one for this symbol
+                        if has_position:
+                            logger.warning("  [WARN] Skipping %s signal - position already open", rec.signal.value)
+                            continue
                         
-                        # Process through orchestrator
-                        recommendations = orchestrator.process_tick(market_data)
+                        # Current market price comes from this cycle's tick snapshot
+                        if not tick:
+                            logger.warning("  [WARN] Could not get current price for %s", symbol)
+                            continue
                         
-                        # Check existing positions
-                        existing_positions = mt5_conn.get_positions(symbol)
-                        has_position = len(existing_positions) > 0
+                        # Use current market price for entry
+                        if rec.signal.value == "buy":
+                            entry_price = tick['ask']
+                        else:
+                            entry_price = tick['bid']
                         
-                        # Execute trades for valid recommendations
-                        for rec in recommendations:
-                            if rec.symbol == symbol:
-                                # Don't open new position if we already have one for this symbol
-                                if has_position:
-                                    print(f"  ⚠️  Skipping {rec.signal.value} signal - position already open")
-                                    continue
-                                
-                                # Get current market price
-                                tick = mt5_conn.get_tick(symbol)
-                                if not tick:
-                                    print(f"  ⚠️  Could not get current price for {symbol}")
-                                    continue
-                                
-                                # Use current market price for entry
-                                if rec.signal.value == "buy":
-                                    entry_price = tick['ask']
-                                else:
-                                    entry_price = tick['bid']
-                                
-                                # Calculate stop loss and take profit FIRST
-                                if rec.signal.value == "buy":
-                                    # For buy: SL below entry, TP above entry
-                                    sl = entry_price * 0.995  # 0.5% stop loss
-                                    tp = entry_price * 1.01   # 1% take profit
-                                else:
-                                    # For sell: SL above entry, TP below entry
-                                    sl = entry_price * 1.005  # 0.5% stop loss
-                                    tp = entry_price * 0.99   # 1% take profit
-                                
-                                # Update recommendation with actual entry price and stop loss
-                                rec.entry_price = entry_price
-                                rec.stop_loss = sl
-                                rec.take_profit = tp
-                                
-                                # Calculate position size AFTER updating entry/SL
-                                position_size = risk_engine.calculate_position_size(rec)
-                                
-                                # Safety check - ensure position size is reasonable
-                                if position_size > 5.0:
-                                    print(f"  ⚠️  Position size {position_size:.2f} lots is too large, capping at 1.0 lots")
-                                    position_size = 1.0
-                                
-                                # Execute trade
-                                print(f"  📊 Signal: {rec.signal.value.upper()} {symbol} @ {entry_price:.5f}")
-                                print(f"     Confidence: {rec.confidence:.2%}, Size: {position_size:.4f} lots")
-                                print(f"     SL: {sl:.5f}, TP: {tp:.5f}")
-                                
-                                result = mt5_conn.place_order(
-                                    symbol=symbol,
-                                    order_type=rec.signal.value,
-                                    volume=position_size,
-                                    sl=sl,
-                                    tp=tp,
-                                    comment=f"Bot-{rec.signal.value}"
-                                )
-                                
-                                if result:
-                                    print(f"  ✅ Order executed! Ticket: {result.get('order', 'N/A')}")
-                                else:
-                                    print(f"  ❌ Order failed!")
+                        # Calculate stop loss and take profit FIRST
+                        if rec.signal.value == "buy":
+                            # For buy: SL below entry, TP above entry
+                            sl = entry_price * 0.995  # 0.5% stop loss
+                            tp = entry_price * 1.01   # 1% take profit
+                        else:
+                            # For sell: SL above entry, TP below entry
+                            sl = entry_price * 1.005  # 0.5% stop loss
+                            tp = entry_price * 0.99   # 1% take profit
                         
-                        last_check_time[symbol] = current_time
+                        # Update recommendation with actual entry price and stop loss
+                        rec.entry_price = entry_price
+                        rec.stop_loss = sl
+                        rec.take_profit = tp
+                        
+                        # Calculate position size AFTER updating entry/SL
+                        position_size = risk_engine.calculate_position_size(rec)
+                        
+                        # Safety check - ensure position size is reasonable
+                        if position_size > 5.0:
+                            logger.warning("  [WARN] Position size %.2f lots is too large, capping at 1.0 lots", position_size)
+                            position_size = 1.0
+                        
+                        # Execute trade
+                        logger.info("  [SIGNAL] %s %s @ %.5f", rec.signal.value.upper(), symbol, entry_price)
+                        logger.info("     Confidence: %.2f%%, Size: %.4f lots", rec.confidence * 100, position_size)
+                        logger.info("     SL: %.5f, TP: %.5f", sl, tp)
+                        
+                        result = await loop.run_in_executor(None, functools.partial(
+                            mt5_conn.place_order,
+                            symbol=symbol,
+                            order_type=rec.signal.value,
+                            volume=position_size,
+                            price=entry_price,
+                            sl=sl,
+                            tp=tp,
+                            comment=f"Bot-{rec.signal.value}"
+                        ))
+                        
+                        if result:
+                            logger.info("  [OK] Order executed! Ticket: %s", result.get('order', 'N/A'))
+                        else:
+                            logger.error("  [FAIL] Order failed!")
             
-            # Monitor existing positions
-            all_positions = mt5_conn.get_positions()
+            # Sleep until just after the next bar closes
+            await asyncio.sleep(seconds_until_next_bar(time.time()))
+    
+    async def position_monitor():
+        """Report open positions on a short fixed interval."""
+        while True:
+            all_positions = await loop.run_in_executor(None, mt5_conn.get_positions)
             if all_positions:
-                print(f"\n📈 Open Positions: {len(all_positions)}")
+                logger.info("[POSITIONS] Open Positions: %d", len(all_positions))
                 for pos in all_positions:
                     pnl = pos['profit']
                     pnl_sign = "+" if pnl >= 0 else ""
-                    print(f"  {pos['symbol']} {pos['type']} | Vol: {pos['volume']:.2f} | P&L: {pnl_sign}${pnl:.2f}")
-            
-            # Sleep before next iteration
-            time.sleep(5)  # Check every 5 seconds
+                    logger.info("  %s %s | Vol: %.2f | P&L: %s$%.2f", pos['symbol'], pos['type'], pos['volume'], pnl_sign, pnl)
             
-    except KeyboardInterrupt:
-        print("\n\n🛑 Stopping trading bot...")
+            await asyncio.sleep(POSITION_MONITOR_INTERVAL)
+    
+    try:
+        # A failure in either loop cancels the other before the executor shuts down
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(signal_loop())
+            tasks.create_task(position_monitor())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        # Log rather than print while the listener runs so shutdown output stays in order
+        logger.info("🛑 Stopping trading bot...")
+        
+        # Wait for executor calls still talking to MT5 before shutting it down
+        await loop.shutdown_default_executor()
         
         # Show final positions
         positions = mt5_conn.get_positions()
         if positions:
-            print(f"\nFinal Positions: {len(positions)}")
+            logger.info("Final Positions: %d", len(positions))
             total_pnl = sum(p['profit'] for p in positions)
-            print(f"Total P&L: ${total_pnl:.2f}")
+            logger.info("Total P&L: $%.2f", total_pnl)
         
         mt5_conn.disconnect()
+        
+        # Stop last so records from draining orders and the disconnect reach the handlers
+        stop_logging(log_listener)
         print("✅ Bot stopped.")
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,17 +1,35 @@
 """MetaTrader 5 connection manager."""
 import MetaTrader5 as mt5
+import logging
 import time
 import os
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable
+from src.core.types import Bars
+
+logger = logging.getLogger(__name__)
 
 class MT5Connection:
     """Manages MT5 connection."""
     
+    # Map timeframe string to MT5 constant
+    _TIMEFRAME_MAP = {
+        'M1': mt5.TIMEFRAME_M1,
+        'M5': mt5.TIMEFRAME_M5,
+        'M15': mt5.TIMEFRAME_M15,
+        'M30': mt5.TIMEFRAME_M30,
+        'H1': mt5.TIMEFRAME_H1,
+        'H4': mt5.TIMEFRAME_H4,
+        'D1': mt5.TIMEFRAME_D1,
+    }
+    
     def __init__(self, server: str, login: int, password: str):
         self.server = server
         self.login = login
         self.password = password
         self.connected = False
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        self._symbol_info_cache: Dict[str, tuple] = {}
     
     def connect(self, retries: int = 3, mt5_path: str = None) -> bool:
         """Connect to MT5 with retries."""
@@ -117,10 +135,14 @@ class MT5Connection:
     
     def disconnect(self):
         """Disconnect from MT5."""
+        # Let in-flight pool calls finish before the terminal goes away; a fresh
+        # pool (threads start lazily) keeps the connection reusable after connect()
+        self._pool.shutdown(wait=True)
+        self._pool = ThreadPoolExecutor(max_workers=4)
         if self.connected:
             mt5.shutdown()
             self.connected = False
-            print("Disconnected from MT5")
+            logger.info("Disconnected from MT5")
     
     def get_account_info(self) -> Optional[Dict]:
         """Get account information."""
@@ -145,7 +167,8 @@ class MT5Connection:
         if not self.connected:
             return None
         
-        symbol_info = mt5.symbol_info(symbol)
+        # Bid/ask are live, so always refresh (this also updates the cache)
+        symbol_info = self._cached_symbol_info(symbol, ttl=0)
         if symbol_info:
             return {
                 'name': symbol_info.name,
@@ -173,36 +196,80 @@ class MT5Connection:
             }
         return None
     
-    def get_rates(self, symbol: str, timeframe, count: int = 100) -> Optional[list]:
-        """Get historical rates for symbol."""
+    def get_rates(self, symbol: str, timeframe, count: int = 100) -> Optional[Bars]:
+        """Get historical rates for symbol as column arrays."""
         if not self.connected:
             return None
         
-        # Map timeframe string to MT5 constant
-        timeframe_map = {
-            'M1': mt5.TIMEFRAME_M1,
-            'M5': mt5.TIMEFRAME_M5,
-            'M15': mt5.TIMEFRAME_M15,
-            'M30': mt5.TIMEFRAME_M30,
-            'H1': mt5.TIMEFRAME_H1,
-            'H4': mt5.TIMEFRAME_H4,
-            'D1': mt5.TIMEFRAME_D1,
-        }
-        
-        mt5_timeframe = timeframe_map.get(timeframe, mt5.TIMEFRAME_M15)
+        mt5_timeframe = self._TIMEFRAME_MAP.get(timeframe, mt5.TIMEFRAME_M15)
         rates = mt5.copy_rates_from_pos(symbol, mt5_timeframe, 0, count)
         
         if rates is not None and len(rates) > 0:
-            return [{
-                'time': rate[0],
-                'open': rate[1],
-                'high': rate[2],
-                'low': rate[3],
-                'close': rate[4],
-                'volume': rate[5]
-            } for rate in rates]
+            return Bars.from_rates(rates)
         return None
     
+    def get_rates_since(self, symbol: str, timeframe, last_time: int, count: int = 16) -> Optional[Bars]:
+        """Get the bars opened at or after ``last_time`` (MT5 epoch seconds).
+        
+        Only the latest ``count`` bars are requested, so if the first returned bar
+        opened after ``last_time`` the gap was longer than ``count`` bars.
+        """
+        bars = self.get_rates(symbol, timeframe, count)
+        if bars is None:
+            return None
+        return bars.select(bars.time >= last_time)
+    
+    def select_symbols(self, symbols: Iterable[str]) -> list:
+        """Add symbols to MarketWatch once so later rate requests skip the lookup.
+        
+        Returns the symbols that could not be selected.
+        """
+        if not self.connected:
+            return list(symbols)
+        
+        failed = [symbol for symbol in symbols if not mt5.symbol_select(symbol, True)]
+        for symbol in failed:
+            logger.warning("  -> Could not select %s: %s", symbol, mt5.last_error())
+        return failed
+    
+    def get_rates_multi(self, symbols: Iterable[str], timeframe, count: int = 100) -> Dict[str, Bars]:
+        """Get historical rates for several symbols in parallel.
+        
+        Symbols without data are omitted from the result.
+        """
+        symbols = list(symbols)
+        if not self.connected or not symbols:
+            return {}
+        
+        all_rates = self._pool.map(lambda symbol: self.get_rates(symbol, timeframe, count), symbols)
+        return {symbol: rates for symbol, rates in zip(symbols, all_rates) if rates is not None}
+    
+    def get_rates_since_multi(self, last_times: Dict[str, int], timeframe, count: int = 16) -> Dict[str, Bars]:
+        """Run ``get_rates_since`` for each ``symbol -> last_time`` in parallel.
+        
+        Symbols without data are omitted from the result.
+        """
+        if not self.connected or not last_times:
+            return {}
+        
+        symbols = list(last_times)
+        all_rates = self._pool.map(
+            lambda symbol: self.get_rates_since(symbol, timeframe, last_times[symbol], count), symbols
+        )
+        return {symbol: rates for symbol, rates in zip(symbols, all_rates) if rates is not None}
+    
+    def get_snapshot(self, symbols: Iterable[str]) -> Dict:
+        """Fetch ticks for ``symbols``, all open positions and account info concurrently."""
+        symbols = list(symbols)
+        positions = self._pool.submit(self.get_positions)
+        account = self._pool.submit(self.get_account_info)
+        ticks = self._pool.map(self.get_tick, symbols)
+        return {
+            'ticks': dict(zip(symbols, ticks)),
+            'positions': positions.result(),
+            'account': account.result()
+        }
+    
     def place_order(self, symbol: str, order_type: str, volume: float, 
                    price: float = None, sl: float = None, tp: float = None, 
                    comment: str = "Trading Bot") -> Optional[Dict]:
@@ -210,53 +277,24 @@ class MT5Connection:
         if not self.connected:
             return None
         
-        # Get symbol info
-        symbol_info = mt5.symbol_info(symbol)
+        # Get symbol info (only static volume/contract fields are used)
+        symbol_info = self._cached_symbol_info(symbol)
         if symbol_info is None:
-            print(f"Symbol {symbol} not found")
+            logger.error("Symbol %s not found", symbol)
             return None
         
         # Convert volume to lots if needed
         # Normal lot sizes are 0.01 to 2.0, so anything > 10 is definitely wrong
         if volume > 10:
-            print(f"  ⚠️  WARNING: Volume {volume} is suspiciously large!")
-            print(f"  Assuming units, converting to lots...")
-            # 1 lot = 100,000 units for standard forex
-            contract_size = getattr(symbol_info, 'trade_contract_size', 100000)
-            volume_lots = volume / contract_size
-            print(f"  Converted {volume} units to {volume_lots:.4f} lots")
+            volume_lots = self._units_to_lots(volume, symbol_info)
         elif volume > 2.0:
-            print(f"  ⚠️  WARNING: Volume {volume} lots seems too large, capping at 1.0 lots")
+            logger.warning("  [WARN] Volume %s lots seems too large, capping at 1.0 lots", volume)
             volume_lots = 1.0
         else:
             # Already in lots and reasonable
             volume_lots = volume
         
-        # Normalize to allowed lot sizes
-        volume_min = symbol_info.volume_min
-        volume_max = symbol_info.volume_max
-        volume_step = symbol_info.volume_step
-        
-        # Round to nearest step (e.g., if step is 0.01, round to 2 decimal places)
-        if volume_step > 0:
-            volume_lots = round(volume_lots / volume_step) * volume_step
-        else:
-            # Fallback: round to 2 decimal places
-            volume_lots = round(volume_lots, 2)
-        
-        # Clamp to min/max
-        volume_lots = max(volume_min, min(volume_max, volume_lots))
-        
-        # Final validation
-        if volume_lots < volume_min:
-            print(f"  ❌ Volume {volume_lots:.4f} is below minimum {volume_min}")
-            return None
-        
-        if volume_lots > volume_max:
-            print(f"  ❌ Volume {volume_lots:.4f} exceeds maximum {volume_max}")
-            return None
-        
-        print(f"  📊 Final volume: {volume_lots:.4f} lots (min: {volume_min}, max: {volume_max}, step: {volume_step})")
+        volume_lots = self._normalize_volume(volume_lots, symbol_info)
         
         # Prepare order request
         if order_type.upper() == "BUY":
@@ -290,7 +328,7 @@ class MT5Connection:
         result = mt5.order_send(request)
         
         if result.retcode != mt5.TRADE_RETCODE_DONE:
-            print(f"Order failed: {result.retcode} - {result.comment}")
+            logger.error("Order failed: %s - %s", result.retcode, result.comment)
             return None
         
         return {
@@ -300,6 +338,51 @@ class MT5Connection:
             'comment': result.comment
         }
     
+    def _cached_symbol_info(self, symbol: str, ttl: float = 3600):
+        """Return ``mt5.symbol_info(symbol)``, reusing a result younger than ``ttl`` seconds.
+        
+        Price fields on a cached result are stale; read only session-constant fields from it.
+        """
+        now = time.monotonic()
+        cached = self._symbol_info_cache.get(symbol)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+        
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is not None:
+            self._symbol_info_cache[symbol] = (now, symbol_info)
+        return symbol_info
+    
+    @staticmethod
+    def _normalize_volume(volume_lots: float, symbol_info) -> float:
+        """Round ``volume_lots`` to the symbol's volume step and clamp it to its min/max.
+        
+        At least one step is always returned, and a non-positive step falls back
+        to 0.01. Out-of-range volumes are intentionally clamped rather than rejected.
+        """
+        volume_min = symbol_info.volume_min
+        volume_max = symbol_info.volume_max
+        volume_step = symbol_info.volume_step if symbol_info.volume_step > 0 else 0.01
+        stepped_lots = max(1, round(volume_lots / volume_step)) * volume_step
+        volume_lots = min(volume_max, max(volume_min, stepped_lots))
+        
+        if volume_lots != stepped_lots:
+            logger.warning("  [WARN] Volume %.4f outside allowed range [%s, %s], clamped to %.4f",
+                           stepped_lots, volume_min, volume_max, volume_lots)
+        
+        logger.info("  [INFO] Final volume: %.4f lots (min: %s, max: %s, step: %s)", volume_lots, volume_min, volume_max, volume_step)
+        return volume_lots
+    
+    def _units_to_lots(self, volume: float, symbol_info) -> float:
+        """Convert a volume given in units to lots using the symbol's contract size."""
+        logger.warning("  [WARN] Volume %s is suspiciously large!", volume)
+        logger.warning("  Assuming units, converting to lots...")
+        # 1 lot = 100,000 units for standard forex
+        contract_size = getattr(symbol_info, 'trade_contract_size', 100000)
+        volume_lots = volume / contract_size
+        logger.info("  Converted %s units to %.4f lots", volume, volume_lots)
+        return volume_lots
+    
     def get_positions(self, symbol: str = None) -> list:
         """Get open positions."""
         if not self.connected:
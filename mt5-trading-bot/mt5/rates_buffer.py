@@ -0,0 +1,79 @@
+"""Per-symbol ring buffer of MT5 rates."""
+from typing import Dict, Iterable, TYPE_CHECKING
+import numpy as np
+from src.core.types import Bars
+
+if TYPE_CHECKING:
+    from .connection import MT5Connection
+
+class RatesBuffer:
+    """Keeps the last ``capacity`` bars per symbol and only fetches the delta.
+
+    The first refresh for a symbol loads ``capacity`` bars. Later refreshes
+    request ``delta_count`` recent bars for all symbols in parallel, overwrite
+    the still-forming last bar and shift closed bars in place. A symbol whose
+    history was shorter than ``capacity`` grows by appending until it is full.
+    Symbols whose fetch fails are left out of that call's result rather than
+    served stale. The bars returned by ``refresh`` are the buffers themselves
+    and are updated on the next call.
+    """
+
+    def __init__(self, connection: "MT5Connection", timeframe: str = 'M15',
+                 capacity: int = 128, delta_count: int = 16):
+        self.connection = connection
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.delta_count = delta_count
+        self.buffers: Dict[str, Bars] = {}
+
+    def refresh(self, symbols: Iterable[str]) -> Dict[str, Bars]:
+        """Bring the buffers for ``symbols`` up to date and return them."""
+        symbols = list(symbols)
+
+        missing = [symbol for symbol in symbols if symbol not in self.buffers]
+        last_times = {
+            symbol: int(self.buffers[symbol].time[-1])
+            for symbol in symbols if symbol in self.buffers
+        }
+        loaded = self.connection.get_rates_multi(missing, self.timeframe, self.capacity) if missing else {}
+        self.buffers.update(loaded)
+        updated = set(loaded)
+
+        # Fetch deltas in parallel, merge on this thread, then reload any symbol that gapped
+        deltas = self.connection.get_rates_since_multi(last_times, self.timeframe, self.delta_count)
+        gapped = []
+        for symbol, new in deltas.items():
+            if self._merge(symbol, new):
+                updated.add(symbol)
+            else:
+                gapped.append(symbol)
+        if gapped:
+            reloaded = self.connection.get_rates_multi(gapped, self.timeframe, self.capacity)
+            self.buffers.update(reloaded)
+            updated.update(reloaded)
+
+        return {symbol: self.buffers[symbol] for symbol in symbols if symbol in updated}
+
+    def _merge(self, symbol: str, new: Bars) -> bool:
+        """Merge bars opened since the last buffered bar; return False if bars were missed."""
+        buffer = self.buffers[symbol]
+        if len(new) == 0:
+            return True
+
+        # The first new bar must be the one we already hold; otherwise we missed bars
+        if new.time[0] != buffer.time[-1]:
+            return False
+
+        if len(buffer) < self.capacity or len(new) > len(buffer):
+            self.buffers[symbol] = Bars(*(
+                np.concatenate((column[:-1], new_column))[-self.capacity:]
+                for column, new_column in zip(buffer.columns(), new.columns())
+            ))
+            return True
+
+        shift = len(new) - 1
+        for column, new_column in zip(buffer.columns(), new.columns()):
+            if shift:
+                column[:-shift] = column[shift:]
+            column[-len(new):] = new_column
+        return True
@@ -1,8 +1,11 @@
 """Strategy execution engine."""
+import logging
 from typing import List, Dict
 from .types import StrategyConfig, StrategyRecommendation
 from ..strategies.base import SignalStrategy
 
+logger = logging.getLogger(__name__)
+
 class StrategyEngine:
     """Manages and executes multiple trading strategies."""
     
@@ -26,7 +29,7 @@ class StrategyEngine:
                     recs = strategy.analyze(market_data, config)
                     recommendations.extend(recs)
                 except Exception as e:
-                    print(f"Error in strategy {name}: {e}")
+                    logger.error("Error in strategy %s: %s", name, e)
         
         return recommendations
     
@@ -11,6 +11,18 @@ class TradingOrchestrator:
         self.strategy_engine = strategy_engine
         self.risk_engine = risk_engine
         self.active_positions = []
+        self.monitored_symbols: frozenset = frozenset()
+        self.rebuild_symbols()
+    
+    def rebuild_symbols(self) -> frozenset:
+        """Recompute the set of monitored symbols from the registered strategies.
+        
+        Call after registering strategies on the engine at runtime.
+        """
+        self.monitored_symbols = frozenset().union(
+            *(config.symbols for config in self.strategy_engine.configs.values())
+        )
+        return self.monitored_symbols
     
     def process_tick(self, market_data: Dict):
         """Process a new market tick."""
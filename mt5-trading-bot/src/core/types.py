@@ -1,20 +1,21 @@
 """Strategy configuration types and data structures."""
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, fields
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from enum import Enum
+import numpy as np
 
 class SignalType(Enum):
     BUY = "buy"
     SELL = "sell"
     HOLD = "hold"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StrategyConfig:
     """Configuration for a trading strategy."""
     name: str
-    symbols: List[str]
-    timeframes: List[str]
+    symbols: Tuple[str, ...]
+    timeframes: Tuple[str, ...]
     enabled: bool = True
     risk_per_trade: float = 0.02
     max_positions: int = 5
@@ -35,3 +36,40 @@ class StrategyRecommendation:
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+
+@dataclass(eq=False)
+class Bars:
+    """OHLC bars stored column-wise (one contiguous array per field).
+    
+    Equality is identity; the generated ``__eq__`` would compare the arrays
+    and raise. Compare columns with numpy instead.
+    """
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def from_rates(cls, rates: np.ndarray) -> "Bars":
+        """Build from the structured array returned by MT5 ``copy_rates_*``."""
+        return cls(
+            time=np.ascontiguousarray(rates['time']),
+            open=np.ascontiguousarray(rates['open']),
+            high=np.ascontiguousarray(rates['high']),
+            low=np.ascontiguousarray(rates['low']),
+            close=np.ascontiguousarray(rates['close']),
+            volume=np.ascontiguousarray(rates['tick_volume'])
+        )
+    
+    def columns(self) -> List[np.ndarray]:
+        """Return the field arrays in declaration order."""
+        return [getattr(self, f.name) for f in fields(self)]
+    
+    def select(self, index) -> "Bars":
+        """Return the bars selected by a slice or boolean mask."""
+        return Bars(*(column[index] for column in self.columns()))
+    
+    def __len__(self) -> int:
+        return len(self.time)
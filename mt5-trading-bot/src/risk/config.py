@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RiskConfig:
     """Risk management configuration."""
     max_drawdown_pct: float = 0.20  # 20% max drawdown
@@ -1,7 +1,10 @@
 """Position sizing calculations."""
+import logging
 from typing import Dict
 from .config import RiskConfig
 
+logger = logging.getLogger(__name__)
+
 def calculate_position_size(
     account_balance: float,
     entry_price: float,
@@ -67,7 +70,7 @@ def calculate_position_size(
     position_size_lots = max(0.01, min(position_size_lots, min(max_position_lots, 2.0)))
     
     # Debug output
-    print(f"    Position sizing: Risk=${risk_amount:.2f}, Pips={stop_loss_pips:.1f}, Lots={position_size_lots:.4f}")
+    logger.info("    Position sizing: Risk=$%.2f, Pips=%.1f, Lots=%.4f", risk_amount, stop_loss_pips, position_size_lots)
     
     return position_size_lots
 
@@ -1,4 +1,5 @@
 """Risk engine orchestrator."""
+import logging
 from typing import Optional
 from ..core.types import StrategyRecommendation
 from .config import RiskConfig
@@ -6,6 +7,8 @@ from .state import RiskState, AccountState
 from .limits import RiskLimits
 from .position_sizing import calculate_position_size
 
+logger = logging.getLogger(__name__)
+
 class RiskEngine:
     """Orchestrates risk management."""
     
@@ -23,25 +26,25 @@ class RiskEngine:
         # Check drawdown
         drawdown_ok, msg = self.limits.check_drawdown(self.risk_state)
         if not drawdown_ok:
-            print(f"Trade rejected: {msg}")
+            logger.warning("Trade rejected: %s", msg)
             return False
         
         # Check daily loss
         daily_ok, msg = self.limits.check_daily_loss(self.risk_state)
         if not daily_ok:
-            print(f"Trade rejected: {msg}")
+            logger.warning("Trade rejected: %s", msg)
             return False
         
         # Check exposure
         exposure_ok, msg = self.limits.check_exposure(self.risk_state)
         if not exposure_ok:
-            print(f"Trade rejected: {msg}")
+            logger.warning("Trade rejected: %s", msg)
             return False
         
         # Check cooldown
         cooldown_ok, msg = self.limits.check_cooldown()
         if not cooldown_ok:
-            print(f"Trade rejected: {msg}")
+            logger.warning("Trade rejected: %s", msg)
             return False
         
         return True
@@ -62,6 +62,6 @@ class RiskState:
     
     def get_total_exposure(self) -> float:
         """Get total exposure."""
-        if not self.account_state:
+        if not self.account_state or not self.positions:
             return 0.0
         return sum(p.volume * p.current_price for p in self.positions) / self.account_state.equity
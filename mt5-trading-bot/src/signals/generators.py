@@ -4,6 +4,10 @@ import numpy as np
 from ..strategies.base import SignalStrategy
 from ..core.types import StrategyConfig, StrategyRecommendation, SignalType
 
+def _column(data, field: str, count: int) -> np.ndarray:
+    """Extract the last ``count`` values of ``field`` as a contiguous float array."""
+    return np.ascontiguousarray(getattr(data, field)[-count:], dtype=np.float64)
+
 class TrendFollowingGenerator(SignalStrategy):
     """Trend following signal generator."""
     
@@ -14,9 +18,9 @@ class TrendFollowingGenerator(SignalStrategy):
             if symbol in market_data:
                 data = market_data[symbol]
                 if len(data) >= 20:
-                    prices = [d['close'] for d in data[-20:]]
-                    sma_short = np.mean(prices[-10:])
-                    sma_long = np.mean(prices[-20:])
+                    prices = _column(data, 'close', 20)
+                    sma_short = prices[-10:].mean()
+                    sma_long = prices.mean()
                     
                     if sma_short > sma_long:
                         recommendations.append(StrategyRecommendation(
@@ -37,9 +41,9 @@ class MeanReversionGenerator(SignalStrategy):
             if symbol in market_data:
                 data = market_data[symbol]
                 if len(data) >= 20:
-                    prices = [d['close'] for d in data[-20:]]
-                    mean = np.mean(prices)
-                    std = np.std(prices)
+                    prices = _column(data, 'close', 20)
+                    mean = prices.mean()
+                    std = prices.std()
                     current = prices[-1]
                     
                     if current < mean - std:
@@ -61,11 +65,9 @@ class BreakoutGenerator(SignalStrategy):
             if symbol in market_data:
                 data = market_data[symbol]
                 if len(data) >= 20:
-                    highs = [d['high'] for d in data[-20:]]
-                    lows = [d['low'] for d in data[-20:]]
-                    resistance = max(highs)
-                    support = min(lows)
-                    current = data[-1]['close']
+                    resistance = _column(data, 'high', 20).max()
+                    support = _column(data, 'low', 20).min()
+                    current = data.close[-1]
                     
                     if current > resistance * 0.99:
                         recommendations.append(StrategyRecommendation(
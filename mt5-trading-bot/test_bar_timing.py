@@ -0,0 +1,24 @@
+"""Unit tests for the bar-close scheduling helper in main."""
+import unittest
+from main import seconds_until_next_bar, BAR_SECONDS, BAR_CLOSE_DELAY
+
+class SecondsUntilNextBarTest(unittest.TestCase):
+
+    def test_mid_bar_waits_for_close_plus_delay(self):
+        now = 10 * BAR_SECONDS + 100
+        self.assertAlmostEqual(seconds_until_next_bar(now), BAR_SECONDS - 100 + BAR_CLOSE_DELAY)
+
+    def test_on_boundary_waits_a_full_bar(self):
+        self.assertAlmostEqual(seconds_until_next_bar(10 * BAR_SECONDS), BAR_SECONDS + BAR_CLOSE_DELAY)
+
+    def test_just_before_close(self):
+        now = 11 * BAR_SECONDS - 0.5
+        self.assertAlmostEqual(seconds_until_next_bar(now), 0.5 + BAR_CLOSE_DELAY)
+
+    def test_result_lands_just_after_a_bar_boundary(self):
+        now = 1_700_000_123.25
+        wake = now + seconds_until_next_bar(now)
+        self.assertAlmostEqual(wake % BAR_SECONDS, BAR_CLOSE_DELAY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Unit tests for MT5Connection._normalize_volume (no MT5 terminal needed)."""
+import unittest
+from types import SimpleNamespace
+from mt5.connection import MT5Connection
+
+def symbol_info(volume_min=0.01, volume_max=100.0, volume_step=0.01):
+    return SimpleNamespace(volume_min=volume_min, volume_max=volume_max, volume_step=volume_step)
+
+class NormalizeVolumeTest(unittest.TestCase):
+
+    def test_on_step_volume_is_unchanged(self):
+        self.assertAlmostEqual(MT5Connection._normalize_volume(0.25, symbol_info()), 0.25)
+
+    def test_off_step_volume_rounds_to_nearest_step(self):
+        self.assertAlmostEqual(MT5Connection._normalize_volume(0.123, symbol_info()), 0.12)
+        self.assertAlmostEqual(MT5Connection._normalize_volume(0.37, symbol_info(volume_step=0.1)), 0.4)
+
+    def test_below_min_is_clamped_up(self):
+        with self.assertLogs('mt5.connection', level='WARNING'):
+            volume = MT5Connection._normalize_volume(0.02, symbol_info(volume_min=0.1, volume_step=0.01))
+        self.assertAlmostEqual(volume, 0.1)
+
+    def test_above_max_is_clamped_down(self):
+        with self.assertLogs('mt5.connection', level='WARNING'):
+            volume = MT5Connection._normalize_volume(7.5, symbol_info(volume_max=5.0))
+        self.assertAlmostEqual(volume, 5.0)
+
+    def test_tiny_volume_rounds_up_to_one_step(self):
+        self.assertAlmostEqual(MT5Connection._normalize_volume(0.001, symbol_info()), 0.01)
+
+    def test_zero_step_falls_back_to_hundredth(self):
+        self.assertAlmostEqual(MT5Connection._normalize_volume(0.123, symbol_info(volume_step=0.0)), 0.12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Unit tests for RatesBuffer merging, using a stub connection (no MT5 terminal needed)."""
+import unittest
+import numpy as np
+from src.core.types import Bars
+from mt5.rates_buffer import RatesBuffer
+
+BAR_SECONDS = 900
+
+class StubConnection:
+    """Serves the latest bars of a synthetic history that tests can advance."""
+
+    def __init__(self, history: int = 400, start: int = 200):
+        times = np.arange(history, dtype=np.int64) * BAR_SECONDS
+        prices = 1.1 + np.arange(history) * 1e-4
+        self.history = Bars(times, prices, prices + 5e-4, prices - 5e-4, prices.copy(), np.ones(history, dtype=np.uint64))
+        self.now = start
+        self.reloads = []
+        self.failing = set()
+
+    def get_rates(self, symbol, timeframe, count=100):
+        if symbol in self.failing:
+            return None
+        # Copy like Bars.from_rates does, so in-place merges never touch the history
+        bars = self.history.select(slice(max(0, self.now - count), self.now))
+        return Bars(*(column.copy() for column in bars.columns()))
+
+    def get_rates_since(self, symbol, timeframe, last_time, count=16):
+        bars = self.get_rates(symbol, timeframe, count)
+        if bars is None:
+            return None
+        return bars.select(bars.time >= last_time)
+
+    def get_rates_multi(self, symbols, timeframe, count=100):
+        self.reloads.extend(symbols)
+        all_rates = {symbol: self.get_rates(symbol, timeframe, count) for symbol in symbols}
+        return {symbol: rates for symbol, rates in all_rates.items() if rates is not None}
+
+    def get_rates_since_multi(self, last_times, timeframe, count=16):
+        all_rates = {symbol: self.get_rates_since(symbol, timeframe, last_time, count)
+                     for symbol, last_time in last_times.items()}
+        return {symbol: rates for symbol, rates in all_rates.items() if rates is not None}
+
+class RatesBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = StubConnection()
+        self.buffer = RatesBuffer(self.conn, capacity=128, delta_count=16)
+        self.buffer.refresh(['EURUSD'])
+        self.conn.reloads.clear()
+
+    def assertMatchesHistory(self, bars, capacity=128):
+        expected = self.conn.history.select(slice(self.conn.now - capacity, self.conn.now))
+        for column, expected_column in zip(bars.columns(), expected.columns()):
+            np.testing.assert_array_equal(column, expected_column)
+
+    def test_forming_bar_is_overwritten_in_place(self):
+        close = self.buffer.buffers['EURUSD'].close
+        self.conn.history.close[self.conn.now - 1] += 0.01
+
+        bars = self.buffer.refresh(['EURUSD'])['EURUSD']
+
+        self.assertIs(bars.close, close)
+        self.assertMatchesHistory(bars)
+        self.assertEqual(self.conn.reloads, [])
+
+    def test_small_gap_shifts_in_place(self):
+        time = self.buffer.buffers['EURUSD'].time
+        self.conn.now += 5
+
+        bars = self.buffer.refresh(['EURUSD'])['EURUSD']
+
+        self.assertIs(bars.time, time)
+        self.assertMatchesHistory(bars)
+        self.assertEqual(self.conn.reloads, [])
+
+    def test_large_gap_reloads(self):
+        self.conn.now += 100
+
+        bars = self.buffer.refresh(['EURUSD'])['EURUSD']
+
+        self.assertMatchesHistory(bars)
+        self.assertEqual(self.conn.reloads, ['EURUSD'])
+
+    def test_failed_delta_skips_symbol(self):
+        self.conn.now += 50
+        self.conn.failing.add('EURUSD')
+
+        self.assertEqual(self.buffer.refresh(['EURUSD']), {})
+
+        self.conn.failing.clear()
+        self.assertMatchesHistory(self.buffer.refresh(['EURUSD'])['EURUSD'])
+
+    def test_short_history_grows_to_capacity(self):
+        self.conn.now = 100
+        buffer = RatesBuffer(self.conn, capacity=128, delta_count=16)
+        self.assertEqual(len(buffer.refresh(['EURUSD'])['EURUSD']), 100)
+
+        for _ in range(4):
+            self.conn.now += 10
+            bars = buffer.refresh(['EURUSD'])['EURUSD']
+
+        self.assertEqual(len(bars), 128)
+        self.assertMatchesHistory(bars)
+
+if __name__ == '__main__':
+    unittest.main()